@@ -5,8 +5,15 @@
 2. 提取CSV中样本数据
 """
 
+import argparse
+import base64
+import hashlib
+import json
 import os
+import re
 import sys
+import time
+import zlib
 import pdfplumber
 import pandas as pd
 from pathlib import Path
@@ -41,6 +48,948 @@ def find_pdf_files(directory):
     return sorted(pdf_files)
 
 
+# 快速哈希读取文件开头和结尾的字节数
+PARTIAL_HASH_BLOCK_SIZE = 64 * 1024
+
+
+def _partial_file_hash(file_path):
+    """
+    计算文件的快速哈希（文件大小 + 开头和结尾各一段字节）
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        哈希字符串
+    """
+    size = os.path.getsize(file_path)
+    hasher = hashlib.sha256(str(size).encode('ascii'))
+    with open(file_path, 'rb') as f:
+        hasher.update(f.read(PARTIAL_HASH_BLOCK_SIZE))
+        if size > PARTIAL_HASH_BLOCK_SIZE:
+            f.seek(max(PARTIAL_HASH_BLOCK_SIZE, size - PARTIAL_HASH_BLOCK_SIZE))
+            hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def _full_file_hash(file_path):
+    """
+    计算文件完整内容的哈希
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        哈希字符串
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def group_duplicate_files(file_paths):
+    """
+    按文件内容对文件分组：先用快速哈希筛选候选，再用完整哈希确认
+
+    Args:
+        file_paths: 文件路径列表
+
+    Returns:
+        字典：每个文件路径 -> 内容相同的原件路径（唯一文件对应自身）
+    """
+    partial_groups = {}
+    for file_path in file_paths:
+        try:
+            key = _partial_file_hash(file_path)
+        except OSError:
+            # 无法读取的文件单独成组，交给后续处理报错
+            key = ('unreadable', file_path)
+        partial_groups.setdefault(key, []).append(file_path)
+
+    canonical = {}
+    for candidates in partial_groups.values():
+        if len(candidates) == 1:
+            canonical[candidates[0]] = candidates[0]
+            continue
+
+        # 快速哈希相同，再计算完整哈希确认
+        full_groups = {}
+        for file_path in candidates:
+            try:
+                key = _full_file_hash(file_path)
+            except OSError:
+                key = ('unreadable', file_path)
+            full_groups.setdefault(key, []).append(file_path)
+
+        for group in full_groups.values():
+            # 优先保留文件名最短的文件（通常是原件，而不是"xxx - 副本.pdf"）
+            original = min(group, key=lambda path: len(os.path.basename(path)))
+            for file_path in group:
+                canonical[file_path] = original
+
+    return canonical
+
+
+# 预筛选：在pdfplumber打开文件之前，直接扫描PDF原始字节判断是否为颗粒报告
+# （可用命令行参数 --no-triage 或菜单选项3关闭）
+ENABLE_TRIAGE = True
+
+# 预筛选结果
+TRIAGE_POSITIVE = 'positive'  # 确认包含目标关键词
+TRIAGE_NEGATIVE = 'negative'  # 确认不是颗粒报告，可直接跳过
+TRIAGE_UNKNOWN = 'unknown'    # 无法判断（加密、字体编码等），交给完整提取
+
+# 目标关键词（与表格识别中的关键词一致，均为小写）
+TRIAGE_KEYWORDS = ['particle', 'size', 'cumulative', 'counts']
+
+# 元数据中需要检查的字段
+TRIAGE_METADATA_KEYS = [b'Title', b'Subject', b'Keywords', b'Producer', b'Creator']
+
+# 可读文本少于该字母数时，认为内容流无法直接解读，返回"无法判断"
+TRIAGE_MIN_TEXT_LETTERS = 20
+
+# 单个数据流解压后的最大字节数，避免在大图片上浪费时间（超出时返回"无法判断"）
+TRIAGE_MAX_STREAM_SIZE = 2 * 1024 * 1024
+
+# 预筛选能解码的数据流过滤器
+_SUPPORTED_FILTERS = [b'FlateDecode', b'Fl', b'ASCII85Decode', b'A85', b'ASCIIHexDecode', b'AHx']
+
+# ToUnicode映射中单个区间最多展开的字符数
+TRIAGE_MAX_CMAP_RANGE = 0x10000
+
+_WHITESPACE = b' \t\r\n\f\x00'
+_OBJECT_PATTERN = re.compile(rb'(?<![\d.])(\d+)\s+(\d+)\s+obj\b')
+_STREAM_START_PATTERN = re.compile(rb'\s*stream\r?\n')
+_STREAM_END_PATTERN = re.compile(rb'\s*endstream')
+_REFERENCE_PATTERN = re.compile(rb'(\d+)\s+(\d+)\s+R')
+_REFERENCE_TAIL_PATTERN = re.compile(rb'\s+\d+\s+R(?![\w])')
+_NAME_PATTERN = re.compile(rb'/[^\s/\[\]<>(){}%]*')
+_NUMBER_PATTERN = re.compile(rb'[-+]?(?:\d+\.?\d*|\.\d+)')
+_KEYWORD_PATTERN = re.compile(rb'[A-Za-z]+')
+_HEX_DIGITS_PATTERN = re.compile(rb'[^0-9A-Fa-f]')
+_CONTENT_TOKEN_PATTERN = re.compile(
+    rb'[(<%]|/[^\s/\[\]<>(){}%]*|(?<![/\w])(?:BT|ET|ID|Tf|Do|q|Q)(?![\w])')
+_LINE_END_PATTERN = re.compile(rb'[\r\n]')
+_INLINE_IMAGE_END_PATTERN = re.compile(rb'\sEI(?![\w])')
+_CODESPACE_PATTERN = re.compile(rb'begincodespacerange(.*?)endcodespacerange', re.DOTALL)
+_BFCHAR_PATTERN = re.compile(rb'beginbfchar(.*?)endbfchar', re.DOTALL)
+_BFRANGE_PATTERN = re.compile(rb'beginbfrange(.*?)endbfrange', re.DOTALL)
+_HEX_PAIR_PATTERN = re.compile(rb'<([0-9A-Fa-f\s]*)>\s*<([0-9A-Fa-f\s]*)>')
+_BFRANGE_ENTRY_PATTERN = re.compile(
+    rb'<([0-9A-Fa-f\s]*)>\s*<([0-9A-Fa-f\s]*)>\s*(<[0-9A-Fa-f\s]*>|\[[^\]]*\])')
+_DIFFERENCES_PATTERN = re.compile(rb'([-+]?\d+)|/([^\s/\[\]<>(){}%]+)')
+
+# 常见字形名对应的文本（/Differences 编码使用）
+_GLYPH_NAMES = {
+    'space': ' ', 'period': '.', 'comma': ',', 'hyphen': '-', 'minus': '-',
+    'slash': '/', 'colon': ':', 'semicolon': ';', 'parenleft': '(', 'parenright': ')',
+    'bracketleft': '[', 'bracketright': ']', 'percent': '%', 'plus': '+', 'equal': '=',
+    'underscore': '_', 'quotesingle': "'", 'quoteright': "'", 'quoteleft': "'",
+    'quotedbl': '"', 'numbersign': '#', 'ampersand': '&', 'asterisk': '*',
+    'less': '<', 'greater': '>', 'degree': '°', 'plusminus': '±', 'mu': 'µ',
+    'micro': 'µ', 'greaterequal': '≥', 'lessequal': '≤', 'endash': '-', 'emdash': '-',
+    'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4',
+    'five': '5', 'six': '6', 'seven': '7', 'eight': '8', 'nine': '9',
+    'fi': 'fi', 'fl': 'fl', 'ff': 'ff', 'ffi': 'ffi', 'ffl': 'ffl',
+}
+
+_LITERAL_ESCAPES = {
+    ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t',
+    ord('b'): b'\b', ord('f'): b'\f',
+}
+
+
+def _read_literal_string(data, start):
+    """
+    读取从start位置（左括号）开始的PDF字面字符串
+
+    字符串中允许出现未转义的成对括号，例如 (Particle Size(um))，
+    也需要处理 \\( \\) \\\\ 和八进制 \\ddd 等转义序列。
+
+    Args:
+        data: 字节数据
+        start: 左括号所在位置
+
+    Returns:
+        (字符串内容, 右括号之后的位置) 元组
+    """
+    result = bytearray()
+    depth = 1
+    pos = start + 1
+    length = len(data)
+    while pos < length:
+        byte = data[pos]
+        if byte == 0x5C:  # 反斜杠
+            pos += 1
+            if pos >= length:
+                break
+            escaped = data[pos]
+            if 0x30 <= escaped <= 0x37:
+                # 八进制转义，最多3位
+                end = pos
+                while end < length and end - pos < 3 and 0x30 <= data[end] <= 0x37:
+                    end += 1
+                result.append(int(data[pos:end], 8) & 0xFF)
+                pos = end
+                continue
+            if escaped == 0x0D:
+                # 反斜杠加换行表示续行
+                pos += 2 if data[pos + 1:pos + 2] == b'\n' else 1
+                continue
+            if escaped != 0x0A:
+                result += _LITERAL_ESCAPES.get(escaped, bytes([escaped]))
+        elif byte == 0x28:
+            depth += 1
+            result.append(byte)
+        elif byte == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(result), pos + 1
+            result.append(byte)
+        else:
+            result.append(byte)
+        pos += 1
+    return bytes(result), length
+
+def _hex_to_bytes(data):
+    """将十六进制字符串内容转换为字节（忽略空白，奇数位补0）"""
+    digits = _HEX_DIGITS_PATTERN.sub(b'', data)
+    if len(digits) % 2:
+        digits += b'0'
+    return bytes.fromhex(digits.decode('ascii'))
+
+
+def _skip_whitespace(data, pos):
+    """跳过空白字符"""
+    while pos < len(data) and data[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _read_container_end(data, pos):
+    """
+    读取从pos位置开始的字典（<<）或数组（[），返回匹配的结束符之后的位置
+    """
+    depth = 0
+    length = len(data)
+    while pos < length:
+        if data.startswith(b'<<', pos):
+            depth += 1
+            pos += 2
+            continue
+        if data.startswith(b'>>', pos):
+            depth -= 1
+            pos += 2
+            if depth == 0:
+                return pos
+            continue
+        byte = data[pos]
+        if byte == 0x5B:  # [
+            depth += 1
+        elif byte == 0x5D:  # ]
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        elif byte == 0x28:  # (
+            pos = _read_literal_string(data, pos)[1]
+            continue
+        elif byte == 0x3C:  # 十六进制字符串
+            end = data.find(b'>', pos)
+            pos = end + 1 if end >= 0 else length
+            continue
+        pos += 1
+    return length
+
+
+def _read_value_end(data, pos):
+    """
+    读取从pos位置开始的一个PDF对象值（字典、数组、字符串、名称、数字或间接引用），
+    返回该值结束的位置
+    """
+    if data.startswith(b'<<', pos) or data.startswith(b'[', pos):
+        return _read_container_end(data, pos)
+    if data.startswith(b'<', pos):
+        end = data.find(b'>', pos)
+        return end + 1 if end >= 0 else len(data)
+    if data.startswith(b'(', pos):
+        return _read_literal_string(data, pos)[1]
+    if data.startswith(b'/', pos):
+        return _NAME_PATTERN.match(data, pos).end()
+    match = _NUMBER_PATTERN.match(data, pos)
+    if match:
+        tail = _REFERENCE_TAIL_PATTERN.match(data, match.end())
+        return tail.end() if tail else match.end()
+    match = _KEYWORD_PATTERN.match(data, pos)
+    return match.end() if match else pos + 1
+
+
+def _parse_dict(value):
+    """
+    解析PDF字典的第一层
+
+    Args:
+        value: 字典的字节（以 << 开头）
+
+    Returns:
+        键名（不含斜杠）到值字节的字典；value不是字典时返回None
+    """
+    if value is None:
+        return None
+    value = value.strip(_WHITESPACE)
+    if not value.startswith(b'<<'):
+        return None
+
+    result = {}
+    pos = 2
+    while True:
+        pos = _skip_whitespace(value, pos)
+        if pos >= len(value) or value.startswith(b'>>', pos):
+            break
+        match = _NAME_PATTERN.match(value, pos)
+        if not match:
+            break
+        value_start = _skip_whitespace(value, match.end())
+        value_end = _read_value_end(value, value_start)
+        result[match.group()[1:]] = value[value_start:value_end]
+        pos = value_end
+    return result
+
+
+def _parse_array(value):
+    """
+    解析PDF数组
+
+    Args:
+        value: 数组的字节（以 [ 开头）
+
+    Returns:
+        元素字节列表；value不是数组时返回None
+    """
+    if value is None:
+        return None
+    value = value.strip(_WHITESPACE)
+    if not value.startswith(b'['):
+        return None
+
+    items = []
+    pos = 1
+    while True:
+        pos = _skip_whitespace(value, pos)
+        if pos >= len(value) or value.startswith(b']', pos):
+            break
+        end = _read_value_end(value, pos)
+        items.append(value[pos:end])
+        pos = end
+    return items
+
+
+def _read_pdf_objects(raw):
+    """
+    读取PDF中的所有对象（包括压缩在对象流中的对象）
+
+    Args:
+        raw: PDF文件的原始字节
+
+    Returns:
+        对象号到 (对象值字节, 数据流原始字节或None) 的字典
+    """
+    objects = {}
+    pos = 0
+    while True:
+        match = _OBJECT_PATTERN.search(raw, pos)
+        if not match:
+            break
+        start = _skip_whitespace(raw, match.end())
+        end = _read_value_end(raw, start)
+        value = raw[start:end]
+        stream = None
+
+        stream_match = _STREAM_START_PATTERN.match(raw, end)
+        if stream_match and value.startswith(b'<<'):
+            data_start = stream_match.end()
+            length = _parse_dict(value).get(b'Length', b'').strip()
+            data_end = -1
+            if length.isdigit() and _STREAM_END_PATTERN.match(raw, data_start + int(length)):
+                data_end = data_start + int(length)
+            if data_end < 0:
+                # /Length 是间接引用或不正确时，查找 endstream
+                data_end = raw.find(b'endstream', data_start)
+                if data_end < 0:
+                    data_end = len(raw)
+            stream = raw[data_start:data_end]
+            end = data_end
+
+        # 增量更新时，后出现的对象覆盖先出现的同号对象
+        objects[int(match.group(1))] = (value, stream)
+        pos = max(end, match.end())
+
+    # 展开对象流中的对象
+    for value, stream in list(objects.values()):
+        stream_dict = _parse_dict(value)
+        if stream is None or stream_dict.get(b'Type') != b'/ObjStm':
+            continue
+        data = _decode_stream(stream_dict, stream)
+        if data is None:
+            continue
+        try:
+            count = int(stream_dict.get(b'N', b''))
+            first = int(stream_dict.get(b'First', b''))
+            header = data[:first].split()
+            numbers = [int(number) for number in header[0::2][:count]]
+            offsets = [int(offset) for offset in header[1::2][:count]]
+        except ValueError:
+            # 对象流头部损坏时跳过，其中的对象无法解析会使结果为"无法判断"
+            continue
+        for i, number in enumerate(numbers[:len(offsets)]):
+            obj_start = first + offsets[i]
+            obj_end = first + offsets[i + 1] if i + 1 < len(offsets) else len(data)
+            objects.setdefault(number, (data[obj_start:obj_end].strip(_WHITESPACE), None))
+    return objects
+
+
+def _resolve(objects, value):
+    """
+    解析间接引用
+
+    Args:
+        objects: _read_pdf_objects 返回的对象字典
+        value: 对象值字节（可能是 "N 0 R" 形式的引用）
+
+    Returns:
+        (对象值字节, 数据流原始字节或None) 元组；引用的对象不存在时返回 (None, None)
+    """
+    for _ in range(8):
+        if value is None:
+            return None, None
+        match = _REFERENCE_PATTERN.fullmatch(value.strip(_WHITESPACE))
+        if not match:
+            return value, None
+        value, stream = objects.get(int(match.group(1)), (None, None))
+        if stream is not None:
+            return value, stream
+    return None, None
+
+
+def _resolve_dict(objects, value):
+    """解析间接引用并返回字典（键名到值字节），不是字典时返回None"""
+    return _parse_dict(_resolve(objects, value)[0])
+
+
+def _decode_stream(stream_dict, data):
+    """
+    按数据流字典中的 /Filter 解码数据流
+
+    Args:
+        stream_dict: 解析后的数据流字典
+        data: 数据流原始字节
+
+    Returns:
+        解码后的字节；无法完整解码（解压失败、超出大小限制、不支持的过滤器）时返回None
+    """
+    filters = stream_dict.get(b'Filter')
+    if filters is None:
+        return data
+
+    names = re.findall(rb'/([^\s/\[\]<>()]+)', filters)
+    if not names or any(name not in _SUPPORTED_FILTERS for name in names):
+        return None
+    # 带预测器的数据（如交叉引用流）解压后不是原始内容
+    if b'DecodeParms' in stream_dict or b'DP' in stream_dict:
+        return None
+
+    for name in names:
+        if name in (b'ASCIIHexDecode', b'AHx'):
+            end = data.find(b'>')
+            data = _hex_to_bytes(data[:end] if end >= 0 else data)
+        elif name in (b'ASCII85Decode', b'A85'):
+            data = data.strip(_WHITESPACE)
+            if data.endswith(b'~>'):
+                data = data[:-2]
+            if data.startswith(b'<~'):
+                data = data[2:]
+            try:
+                data = base64.a85decode(data, ignorechars=_WHITESPACE)
+            except ValueError:
+                return None
+        else:
+            decompressor = zlib.decompressobj()
+            try:
+                data = decompressor.decompress(data, TRIAGE_MAX_STREAM_SIZE)
+            except zlib.error:
+                return None
+            if decompressor.unconsumed_tail:
+                return None
+    return data
+
+
+def _parse_to_unicode(data):
+    """
+    解析ToUnicode CMap（bfchar和bfrange）
+
+    Args:
+        data: 解码后的CMap字节
+
+    Returns:
+        (编码字节长度列表, 编码 -> 文本 字典)；无法解析时返回None
+    """
+    def to_text(hex_data):
+        return _hex_to_bytes(hex_data).decode('utf-16-be', errors='replace')
+
+    mapping = {}
+    for block in _BFCHAR_PATTERN.findall(data):
+        for source, target in _HEX_PAIR_PATTERN.findall(block):
+            mapping[_hex_to_bytes(source)] = to_text(target)
+
+    for block in _BFRANGE_PATTERN.findall(data):
+        for low, high, target in _BFRANGE_ENTRY_PATTERN.findall(block):
+            low = _hex_to_bytes(low)
+            width = len(low)
+            low = int.from_bytes(low, 'big')
+            high = int.from_bytes(_hex_to_bytes(high), 'big')
+            if high < low or high - low >= TRIAGE_MAX_CMAP_RANGE:
+                return None
+            if target.startswith(b'['):
+                targets = re.findall(rb'<([0-9A-Fa-f\s]*)>', target)
+                for offset, item in enumerate(targets[:high - low + 1]):
+                    mapping[(low + offset).to_bytes(width, 'big')] = to_text(item)
+            else:
+                target = _hex_to_bytes(target[1:-1])
+                base = int.from_bytes(target, 'big')
+                for offset in range(high - low + 1):
+                    try:
+                        text = (base + offset).to_bytes(len(target), 'big')
+                    except OverflowError:
+                        return None
+                    mapping[(low + offset).to_bytes(width, 'big')] = \
+                        text.decode('utf-16-be', errors='replace')
+
+    widths = set()
+    for block in _CODESPACE_PATTERN.findall(data):
+        for low, _high in _HEX_PAIR_PATTERN.findall(block):
+            widths.add(len(_hex_to_bytes(low)))
+    if not widths:
+        widths = set(len(code) for code in mapping)
+    if not mapping or not widths:
+        return None
+    return sorted(widths), mapping
+
+
+def _glyph_name_to_text(name):
+    """将字形名转换为文本，无法识别时返回None"""
+    if len(name) == 1 and name.isascii() and name.isalnum():
+        return name
+    if name in _GLYPH_NAMES:
+        return _GLYPH_NAMES[name]
+    if name.startswith('uni') and len(name) == 7:
+        try:
+            return chr(int(name[3:], 16))
+        except ValueError:
+            return None
+    return None
+
+
+def _build_font_decoder(objects, font_value):
+    """
+    根据字体字典生成字符串解码函数
+
+    优先使用 /ToUnicode 映射；没有映射时，只有使用标准编码（可带 /Differences）的
+    简单字体才能直接读取。复合字体（Type0）没有映射时无法读取。
+
+    Args:
+        objects: _read_pdf_objects 返回的对象字典
+        font_value: 字体资源的值字节（引用或内联字典）
+
+    Returns:
+        解码函数 decode(字节, 是否十六进制字符串) -> 文本或None；字体无法读取时返回None
+    """
+    font_dict = _resolve_dict(objects, font_value)
+    if font_dict is None:
+        return None
+
+    if b'ToUnicode' in font_dict:
+        cmap_value, cmap_stream = _resolve(objects, font_dict[b'ToUnicode'])
+        cmap_dict = _parse_dict(cmap_value)
+        if cmap_stream is None or cmap_dict is None:
+            return None
+        cmap_data = _decode_stream(cmap_dict, cmap_stream)
+        cmap = _parse_to_unicode(cmap_data) if cmap_data is not None else None
+        if cmap is None:
+            return None
+        widths, mapping = cmap
+
+        def decode_with_cmap(data, is_hex):
+            chars = []
+            pos = 0
+            while pos < len(data):
+                for width in widths:
+                    code = data[pos:pos + width]
+                    if code in mapping:
+                        chars.append(mapping[code])
+                        pos += width
+                        break
+                else:
+                    return None
+            return ''.join(chars)
+
+        return decode_with_cmap
+
+    # 复合字体（包括使用预定义CMap的STSong-Light等）没有映射时无法读取
+    if font_dict.get(b'Subtype') == b'/Type0':
+        return None
+
+    differences = {}
+    if b'Encoding' in font_dict:
+        encoding_value = _resolve(objects, font_dict[b'Encoding'])[0]
+        if encoding_value is None:
+            return None
+        encoding_dict = _parse_dict(encoding_value)
+        if encoding_dict is not None and b'Differences' in encoding_dict:
+            differences_value = _resolve(objects, encoding_dict[b'Differences'])[0]
+            if differences_value is None:
+                return None
+            code = 0
+            for number, name in _DIFFERENCES_PATTERN.findall(differences_value):
+                if number:
+                    code = int(number)
+                else:
+                    differences[code] = name.decode('latin-1')
+                    code += 1
+    else:
+        # 没有编码的符号字体（子集TrueType等），字节是字形序号而不是字符
+        descriptor = _resolve_dict(objects, font_dict.get(b'FontDescriptor'))
+        if descriptor is not None:
+            try:
+                flags = int(descriptor.get(b'Flags', b'0'))
+            except ValueError:
+                return None
+            if flags & 4 and not flags & 32:
+                return None
+
+    def decode_simple(data, is_hex):
+        # 十六进制字符串只有在字体提供映射时才认为可读
+        if is_hex:
+            return None
+        chars = []
+        for code in data:
+            if code in differences:
+                text = _glyph_name_to_text(differences[code])
+                if text is None:
+                    return None
+                chars.append(text)
+            else:
+                chars.append(chr(code))
+        return ''.join(chars)
+
+    return decode_simple
+
+
+def _scan_content_stream(data):
+    """
+    扫描内容流，取出文本块中的字符串及其使用的字体，以及调用的XObject
+
+    Args:
+        data: 解码后的内容流字节
+
+    Returns:
+        ([(字体资源名, 字符串字节, 是否十六进制字符串)], [XObject资源名]) 元组
+    """
+    strings = []
+    xobjects = []
+    in_text = False
+    font = None
+    font_stack = []
+    last_name = None
+    pos = 0
+    while True:
+        match = _CONTENT_TOKEN_PATTERN.search(data, pos)
+        if not match:
+            break
+        token = match.group()
+        pos = match.end()
+        if token == b'(':
+            literal, pos = _read_literal_string(data, match.start())
+            if in_text:
+                strings.append((font, literal, False))
+        elif token == b'<':
+            if data[pos:pos + 1] == b'<':
+                # 字典开始，不是字符串
+                pos += 1
+                continue
+            end = data.find(b'>', pos)
+            if end < 0:
+                break
+            if in_text:
+                strings.append((font, _hex_to_bytes(data[pos:end]), True))
+            pos = end + 1
+        elif token == b'%':
+            # 注释，跳到行尾
+            end = _LINE_END_PATTERN.search(data, pos)
+            pos = end.end() if end else len(data)
+        elif token.startswith(b'/'):
+            last_name = token[1:]
+        elif token == b'BT':
+            in_text = True
+        elif token == b'ET':
+            in_text = False
+        elif token == b'Tf':
+            font = last_name
+        elif token == b'Do':
+            if last_name is not None:
+                xobjects.append(last_name)
+        elif token == b'q':
+            font_stack.append(font)
+        elif token == b'Q':
+            if font_stack:
+                font = font_stack.pop()
+        else:
+            # 内嵌图片数据，跳到EI
+            end = _INLINE_IMAGE_END_PATTERN.search(data, pos)
+            pos = end.end() if end else len(data)
+    return strings, xobjects
+
+
+def _collect_content_text(objects, data, resources, texts, state, visited):
+    """
+    解码内容流中的文本，并递归处理其中调用的表单XObject
+
+    Args:
+        objects: _read_pdf_objects 返回的对象字典
+        data: 解码后的内容流字节
+        resources: 内容流使用的资源字典
+        texts: 解码后的文本列表（结果追加到此列表）
+        state: 状态字典，记录是否存在无法解码的数据流或无法读取的文本
+        visited: 已处理的表单XObject引用集合
+    """
+    fonts = _resolve_dict(objects, resources.get(b'Font')) or {}
+    xobjects = _resolve_dict(objects, resources.get(b'XObject')) or {}
+    decoders = {}
+
+    strings, xobject_names = _scan_content_stream(data)
+    for font_name, string, is_hex in strings:
+        if font_name not in decoders:
+            font_value = fonts.get(font_name)
+            decoders[font_name] = _build_font_decoder(objects, font_value) if font_value else None
+        decoder = decoders[font_name]
+        text = decoder(string, is_hex) if decoder else None
+        if text is None:
+            state['unreadable'] = True
+        else:
+            texts.append(text)
+
+    for name in xobject_names:
+        reference = xobjects.get(name)
+        value, stream = _resolve(objects, reference)
+        xobject_dict = _parse_dict(value)
+        if stream is None or xobject_dict is None:
+            state['unreadable'] = True
+            continue
+        # 只处理表单，图片等其他XObject不包含文本
+        if xobject_dict.get(b'Subtype') != b'/Form':
+            continue
+        if reference in visited:
+            continue
+        visited.add(reference)
+
+        form_data = _decode_stream(xobject_dict, stream)
+        if form_data is None:
+            state['undecodable'] = True
+            continue
+        form_resources = resources
+        if b'Resources' in xobject_dict:
+            form_resources = _resolve_dict(objects, xobject_dict[b'Resources']) or {}
+        _collect_content_text(objects, form_data, form_resources, texts, state, visited)
+
+
+def _page_resources(objects, page_dict):
+    """返回页面的资源字典（页面没有时沿 /Parent 向上继承）"""
+    node = page_dict
+    for _ in range(32):
+        if node is None:
+            break
+        if b'Resources' in node:
+            return _resolve_dict(objects, node[b'Resources']) or {}
+        node = _resolve_dict(objects, node.get(b'Parent'))
+    return {}
+
+
+def _read_pdf_metadata(raw):
+    """
+    从PDF原始字节中读取文档信息字典中的文本字段
+
+    Args:
+        raw: PDF文件的原始字节
+
+    Returns:
+        字段名到字段值（bytes）的字典
+    """
+    metadata = {}
+    for key in TRIAGE_METADATA_KEYS:
+        match = re.search(rb'/' + key + rb'\s*\(', raw)
+        if match:
+            metadata[key.decode('ascii')] = _read_literal_string(raw, match.end() - 1)[0]
+    return metadata
+
+
+def triage_pdf(pdf_path):
+    """
+    快速预筛选PDF文件，不经过pdfplumber解析
+
+    先检查元数据（标题、生成程序等），再按页面读取内容流（包括表单XObject），
+    用每个字符串所用字体的 /ToUnicode 映射或简单编码解码文本，判断文件中是否出现
+    目标关键词。只有在所有内容流都能解码、所有文本都能读取，并且能读出足够文本却
+    找不到关键词时才判定为非颗粒报告，其余情况交给完整提取处理。
+
+    Args:
+        pdf_path: PDF文件路径
+
+    Returns:
+        (预筛选结果, 原因说明) 元组
+    """
+    try:
+        with open(pdf_path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        return TRIAGE_UNKNOWN, f"读取文件失败 - {str(e)}"
+
+    if not raw.startswith(b'%PDF'):
+        return TRIAGE_UNKNOWN, "文件头不是PDF格式"
+
+    # 加密文件的内容流无法直接读取
+    if b'/Encrypt' in raw:
+        return TRIAGE_UNKNOWN, "文件已加密"
+
+    # 1. 检查元数据
+    metadata = _read_pdf_metadata(raw)
+    metadata_text = b' '.join(metadata.values()).decode('latin-1').lower()
+    if all(keyword in metadata_text for keyword in TRIAGE_KEYWORDS):
+        return TRIAGE_POSITIVE, "元数据包含目标关键词"
+
+    # 2. 按页面解码内容流中的文本
+    objects = _read_pdf_objects(raw)
+    pages = [page_dict for page_dict in (_parse_dict(value) for value, _ in objects.values())
+             if page_dict is not None and page_dict.get(b'Type') == b'/Page']
+    if not pages:
+        return TRIAGE_UNKNOWN, "未找到页面对象"
+
+    texts = []
+    state = {'undecodable': False, 'unreadable': False}
+    visited = set()
+    for page_dict in pages:
+        if b'Contents' not in page_dict:
+            continue
+        value, stream = _resolve(objects, page_dict[b'Contents'])
+        if stream is not None:
+            parts = [(value, stream)]
+        else:
+            parts = [_resolve(objects, item) for item in _parse_array(value) or []]
+            if not parts:
+                state['undecodable'] = True
+
+        # 页面内容可以分成多个数据流，需要拼接后再扫描
+        page_data = []
+        for part_value, part_stream in parts:
+            part_dict = _parse_dict(part_value)
+            data = None
+            if part_stream is not None and part_dict is not None:
+                data = _decode_stream(part_dict, part_stream)
+            if data is None:
+                state['undecodable'] = True
+                break
+            page_data.append(data)
+        else:
+            _collect_content_text(objects, b'\n'.join(page_data),
+                                  _page_resources(objects, page_dict), texts, state, visited)
+
+    # 同一个单词可能被拆成多个字符串（字距调整），因此直接拼接
+    content_text = ''.join(texts).lower()
+    if all(keyword in content_text for keyword in TRIAGE_KEYWORDS):
+        return TRIAGE_POSITIVE, "内容流包含目标关键词"
+
+    if state['undecodable']:
+        return TRIAGE_UNKNOWN, "存在无法完整解码的数据流"
+
+    if state['unreadable']:
+        return TRIAGE_UNKNOWN, "内容流使用无法解码的字体，无法直接读取文本"
+
+    letter_count = sum(1 for char in content_text if char.isalpha())
+    if letter_count < TRIAGE_MIN_TEXT_LETTERS:
+        return TRIAGE_UNKNOWN, "内容流中可读文本过少"
+
+    producer = metadata.get('Producer', b'').decode('latin-1', errors='replace')
+    reason = "内容流中未找到目标关键词"
+    if producer:
+        reason += f"（生成程序: {producer}）"
+    return TRIAGE_NEGATIVE, reason
+
+
+def evaluate_triage(directory):
+    """
+    校验预筛选的准确性：对目录中每个PDF同时运行预筛选和完整提取，
+    统计被预筛选跳过但实际能提取到数据的文件（漏检）
+
+    Args:
+        directory: PDF文件所在目录
+
+    Returns:
+        统计结果字典，如果目录中没有PDF文件则返回None
+    """
+    pdf_files = find_pdf_files(directory)
+    if not pdf_files:
+        print(f"\n在路径 {directory} 中未找到PDF文件！")
+        return None
+
+    rows = []
+    for pdf_file in pdf_files:
+        start = time.perf_counter()
+        verdict, reason = triage_pdf(pdf_file)
+        triage_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        extracted_data = extract_table_from_pdf(pdf_file)
+        extract_time = time.perf_counter() - start
+
+        rows.append({
+            '文件名': os.path.basename(pdf_file),
+            '预筛选结果': verdict,
+            '原因': reason,
+            '可提取数据': extracted_data is not None and not extracted_data.empty,
+            '预筛选耗时(秒)': round(triage_time, 4),
+            '完整提取耗时(秒)': round(extract_time, 4),
+        })
+
+    report_df = pd.DataFrame(rows)
+    extractable = report_df[report_df['可提取数据']]
+    negatives = report_df[report_df['预筛选结果'] == TRIAGE_NEGATIVE]
+    false_negatives = negatives[negatives['可提取数据']]
+
+    stats = {
+        '文件总数': len(report_df),
+        '可提取文件数': len(extractable),
+        '判定跳过文件数': len(negatives),
+        '漏检文件数': len(false_negatives),
+        '漏检率': len(false_negatives) / len(extractable) if len(extractable) else 0.0,
+        '跳过文件预筛选耗时(秒)': negatives['预筛选耗时(秒)'].sum(),
+        '跳过文件完整提取耗时(秒)': negatives['完整提取耗时(秒)'].sum(),
+    }
+
+    print("\n\n预筛选校验结果:")
+    print(report_df.to_string(index=False))
+    print()
+    for key, value in stats.items():
+        if key == '漏检率':
+            print(f"  {key}: {value:.2%}")
+        else:
+            print(f"  {key}: {value}")
+    if len(false_negatives) > 0:
+        print("\n  漏检文件:")
+        for file_name in false_negatives['文件名']:
+            print(f"    {file_name}")
+
+    return stats
+
+
 def extract_table_from_pdf(pdf_path):
     """
     从PDF文件中提取表格数据
@@ -252,6 +1201,142 @@ def extract_table_from_pdf(pdf_path):
     return None
 
 
+def process_pdf_document(pdf_file):
+    """
+    预筛选并提取单个PDF文件的数据
+
+    Args:
+        pdf_file: PDF文件路径
+
+    Returns:
+        (提取的数据或None, 是否被预筛选跳过) 元组
+    """
+    file_name = os.path.basename(pdf_file)
+
+    # 预筛选：跳过明显不是颗粒报告的文件
+    if ENABLE_TRIAGE:
+        verdict, reason = triage_pdf(pdf_file)
+        if verdict == TRIAGE_NEGATIVE:
+            print(f"\n[跳过] {file_name}: {reason}")
+            return None, True
+
+    extracted_data = extract_table_from_pdf(pdf_file)
+    
+    if extracted_data is not None and not extracted_data.empty:
+        print(f"\n[成功] 成功提取 {file_name} 的数据:")
+        print(extracted_data.to_string(index=False))
+    else:
+        print(f"\n[失败] 未能从 {file_name} 提取数据")
+    return extracted_data, False
+
+
+def print_parse_report(file_count, parsed_count, skipped_files, duplicate_of, file_sizes):
+    """
+    打印解析情况：实际完整解析的文件数、预筛选跳过的文件数，以及重复文件避免的完整解析次数
+
+    Args:
+        file_count: 文件总数
+        parsed_count: 实际调用完整提取的文件数
+        skipped_files: 被预筛选跳过的文件名列表（只包含原件）
+        duplicate_of: 重复文件名 -> 原件文件名
+        file_sizes: 文件名 -> 文件大小（字节）
+    """
+    print(f"\n实际完整解析 {parsed_count}/{file_count} 个文件")
+
+    if skipped_files:
+        print(f"预筛选跳过 {len(skipped_files)} 个非颗粒报告文件")
+
+    if duplicate_of:
+        # 原件被预筛选跳过时，重复文件本来也不会被完整解析
+        skipped = set(skipped_files)
+        avoided_files = [file_name for file_name, original_name in duplicate_of.items()
+                         if original_name not in skipped]
+        saved_bytes = sum(file_sizes.get(file_name, 0) for file_name in avoided_files)
+        print(f"重复文件 {len(duplicate_of)} 个，避免完整解析 {len(avoided_files)} 次"
+              f"（节省 {saved_bytes / 1024 / 1024:.2f} MB）")
+
+
+def build_pdf_summary(results, duplicate_of):
+    """
+    将PDF提取结果转换为汇总表
+
+    Args:
+        results: 按文件顺序排列的字典，文件名 -> 提取的数据
+        duplicate_of: 重复文件名 -> 原件文件名
+
+    Returns:
+        汇总表DataFrame
+    """
+    # 定义目标颗粒尺寸
+    target_sizes = [2, 5, 10, 25, 50]
+    
+    # 创建汇总表
+    summary_data = []
+    
+    for idx, (file_name, data) in enumerate(results.items(), 1):
+        # 提取样品名称（去掉.pdf扩展名）
+        sample_name = os.path.splitext(file_name)[0]
+        
+        # 创建一行数据
+        row_data = {
+            '序号': idx,
+            '样品名称': sample_name
+        }
+        
+        # 初始化所有颗粒尺寸列为0
+        for size in target_sizes:
+            row_data[f'≥{size} μm'] = 0
+        
+        # 从提取的数据中查找对应颗粒尺寸的值
+        for _, row in data.iterrows():
+            particle_size = row['Particle Size(µm)']
+            cumulative_counts = row['Cumulative Counts/mL']
+            
+            # 检查是否是目标尺寸之一
+            if pd.notna(particle_size) and pd.notna(cumulative_counts):
+                particle_size = float(particle_size)
+                cumulative_counts = float(cumulative_counts)
+                
+                # 找到匹配的尺寸列
+                for size in target_sizes:
+                    if abs(particle_size - size) < 0.01:  # 允许小的浮点误差
+                        row_data[f'≥{size} μm'] = cumulative_counts
+                        break
+        
+        # 标记重复文件
+        if file_name in duplicate_of:
+            row_data['备注'] = f"与 {os.path.splitext(duplicate_of[file_name])[0]} 重复"
+        else:
+            row_data['备注'] = ''
+        
+        summary_data.append(row_data)
+    
+    # 创建汇总DataFrame
+    summary_df = pd.DataFrame(summary_data)
+    
+    # 重新排列列的顺序
+    column_order = ['序号', '样品名称'] + [f'≥{size} μm' for size in target_sizes] + ['备注']
+    return summary_df[column_order]
+
+
+def save_summary(summary_df, output_file):
+    """
+    打印汇总表并保存到Excel文件（只保存汇总表）
+
+    Args:
+        summary_df: 汇总表DataFrame
+        output_file: 输出Excel文件路径
+    """
+    print(f"\n\n汇总表:")
+    print(summary_df.to_string(index=False))
+    
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        summary_df.to_excel(writer, sheet_name='结果汇总', index=False)
+    
+    print(f"\n\n所有结果已保存到: {output_file}")
+    print(f"汇总表已保存到工作表: 结果汇总")
+
+
 def function1_extract_pdf():
     """功能1：提取PDF中样品数据"""
     print("\n" + "=" * 60)
@@ -292,79 +1377,53 @@ def function1_extract_pdf():
     for i, pdf_file in enumerate(pdf_files, 1):
         print(f"  {i}. {os.path.basename(pdf_file)}")
     
-    # 3. 处理每个PDF文件
+    # 3. 查找内容相同的重复文件，每份内容只解析一次
+    canonical_files = group_duplicate_files(pdf_files)
+    duplicate_of = {}
+    for pdf_file in pdf_files:
+        if canonical_files[pdf_file] != pdf_file:
+            duplicate_of[os.path.basename(pdf_file)] = os.path.basename(canonical_files[pdf_file])
+
+    if duplicate_of:
+        print(f"\n发现 {len(duplicate_of)} 个重复文件:")
+        for file_name, original_name in duplicate_of.items():
+            print(f"  {file_name} 与 {original_name} 内容相同")
+
+    # 4. 处理每个PDF文件（重复文件只解析原件）
+    extracted_cache = {}
+    skipped_files = []
+    parsed_count = 0
+
+    for pdf_file in pdf_files:
+        if canonical_files[pdf_file] != pdf_file:
+            continue
+        extracted_data, skipped = process_pdf_document(pdf_file)
+        extracted_cache[pdf_file] = extracted_data
+        if skipped:
+            skipped_files.append(os.path.basename(pdf_file))
+        else:
+            parsed_count += 1
+
+    # 按原文件顺序汇总结果，重复文件复用已提取的数据
     results = {}
-    
     for pdf_file in pdf_files:
         file_name = os.path.basename(pdf_file)
-        extracted_data = extract_table_from_pdf(pdf_file)
-        
+        extracted_data = extracted_cache[canonical_files[pdf_file]]
         if extracted_data is not None and not extracted_data.empty:
             results[file_name] = extracted_data
-            print(f"\n[成功] 成功提取 {file_name} 的数据:")
-            print(extracted_data.to_string(index=False))
-        else:
-            print(f"\n[失败] 未能从 {file_name} 提取数据")
-    
-    # 4. 将结果转换为汇总表格式
+            if file_name in duplicate_of:
+                print(f"\n[重复] {file_name} 复用 {duplicate_of[file_name]} 的提取数据")
+
+    file_sizes = {os.path.basename(pdf_file): os.path.getsize(pdf_file) for pdf_file in pdf_files}
+    print_parse_report(len(pdf_files), parsed_count, skipped_files, duplicate_of, file_sizes)
+
+    # 5. 将结果转换为汇总表格式
     if results:
-        # 定义目标颗粒尺寸
-        target_sizes = [2, 5, 10, 25, 50]
-        
-        # 创建汇总表
-        summary_data = []
-        
-        for idx, (file_name, data) in enumerate(results.items(), 1):
-            # 提取样品名称（去掉.pdf扩展名）
-            sample_name = os.path.splitext(file_name)[0]
-            
-            # 创建一行数据
-            row_data = {
-                '序号': idx,
-                '样品名称': sample_name
-            }
-            
-            # 初始化所有颗粒尺寸列为0
-            for size in target_sizes:
-                row_data[f'≥{size} μm'] = 0
-            
-            # 从提取的数据中查找对应颗粒尺寸的值
-            for _, row in data.iterrows():
-                particle_size = row['Particle Size(µm)']
-                cumulative_counts = row['Cumulative Counts/mL']
-                
-                # 检查是否是目标尺寸之一
-                if pd.notna(particle_size) and pd.notna(cumulative_counts):
-                    particle_size = float(particle_size)
-                    cumulative_counts = float(cumulative_counts)
-                    
-                    # 找到匹配的尺寸列
-                    for size in target_sizes:
-                        if abs(particle_size - size) < 0.01:  # 允许小的浮点误差
-                            row_data[f'≥{size} μm'] = cumulative_counts
-                            break
-            
-            summary_data.append(row_data)
-        
-        # 创建汇总DataFrame
-        summary_df = pd.DataFrame(summary_data)
-        
-        # 重新排列列的顺序
-        column_order = ['序号', '样品名称'] + [f'≥{size} μm' for size in target_sizes]
-        summary_df = summary_df[column_order]
+        summary_df = build_pdf_summary(results, duplicate_of)
         
-        print(f"\n\n汇总表:")
-        print(summary_df.to_string(index=False))
-        
-        # 5. 保存结果到Excel文件（只保存汇总表）
+        # 6. 保存结果到Excel文件（只保存汇总表）
         # 输出文件保存到PDF文件所在的目录
-        output_file = os.path.join(pdf_path, '提取结果.xlsx')
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            # 只保存汇总表
-            summary_df.to_excel(writer, sheet_name='结果汇总', index=False)
-        
-        print(f"\n\n所有结果已保存到: {output_file}")
-        print(f"汇总表已保存到工作表: 结果汇总")
+        save_summary(summary_df, os.path.join(pdf_path, '提取结果.xlsx'))
     else:
         print("\n未提取到任何数据，无法生成汇总表")
     
@@ -436,6 +1495,103 @@ def extract_csv_data(csv_path):
         return None
 
 
+def csv_sample_name(file_name):
+    """
+    根据CSV文件名得到样品名称（去掉.csv扩展名和_summary后缀）
+
+    Args:
+        file_name: CSV文件名
+
+    Returns:
+        样品名称
+    """
+    sample_name = os.path.splitext(file_name)[0]  # 去掉.csv
+    if sample_name.endswith('_summary'):
+        sample_name = sample_name[:-8]  # 去掉_summary
+    return sample_name
+
+
+def process_csv_document(csv_file):
+    """
+    提取单个CSV文件的数据并打印处理结果
+
+    Args:
+        csv_file: CSV文件路径
+
+    Returns:
+        提取的数据（DataFrame），如果失败则返回None
+    """
+    print(f"\n正在处理: {os.path.basename(csv_file)}")
+    
+    # 提取数据
+    extracted_data = extract_csv_data(csv_file)
+    
+    if extracted_data is not None and not extracted_data.empty:
+        print(f"  [成功] 成功提取数据")
+        return extracted_data
+    
+    print(f"  [失败] 未能提取数据")
+    return None
+
+
+def build_csv_summary(results):
+    """
+    将CSV提取结果转换为汇总表
+
+    Args:
+        results: 按文件顺序排列的字典，样品名称 -> 提取的数据
+
+    Returns:
+        汇总表DataFrame
+    """
+    # 定义ESD类型列
+    esd_columns = [
+        'ESD 1-2 um', 'ESD 2-5 um', 'ESD 5-10 um', 'ESD 10-25 um', 
+        'ESD 25-50 um', 'ESD 50 um+',
+        'ESD 1-2 um SO', 'ESD 2-5 um SO', 'ESD 5-10 um SO', 
+        'ESD 10-25 um SO', 'ESD 25-50 um SO', 'ESD 50 um +SO'
+    ]
+    
+    # 创建汇总表
+    summary_data = []
+    
+    for idx, (sample_name, data) in enumerate(results.items(), 1):
+        # 创建一行数据
+        row_data = {
+            '序号': idx,
+            '样品名称': sample_name
+        }
+        
+        # 初始化所有ESD列为0
+        for col in esd_columns:
+            row_data[col] = 0
+        
+        # 从提取的数据中查找对应ESD类型的值
+        # 按照顺序匹配：ESD 1-2 um, ESD 2-5 um, ESD 5-10 um, ESD 10-25 um, 
+        # ESD 25-50 um, ESD 50 um+, ESD 1-2 um SO, ESD 2-5 um SO, 
+        # ESD 5-10 um SO, ESD 10-25 um SO, ESD 25-50 um SO, ESD 50 um +SO
+        for i, (_, row) in enumerate(data.iterrows()):
+            esd_type = str(row['ESD类型']).strip()
+            value = row['数值']
+            
+            if pd.notna(value) and i < len(esd_columns):
+                try:
+                    value = float(value)
+                    # 直接按顺序匹配（第31-42行对应12个ESD类型）
+                    row_data[esd_columns[i]] = value
+                except:
+                    pass
+        
+        summary_data.append(row_data)
+    
+    # 创建汇总DataFrame
+    summary_df = pd.DataFrame(summary_data)
+    
+    # 重新排列列的顺序
+    column_order = ['序号', '样品名称'] + esd_columns
+    return summary_df[column_order]
+
+
 def function2_extract_csv():
     """功能2：提取CSV中样本数据"""
     print("\n" + "=" * 60)
@@ -480,82 +1636,16 @@ def function2_extract_csv():
     results = {}
     
     for csv_file in csv_files:
-        file_name = os.path.basename(csv_file)
-        print(f"\n正在处理: {file_name}")
-        
-        # 提取数据
-        extracted_data = extract_csv_data(csv_file)
-        
-        if extracted_data is not None and not extracted_data.empty:
-            # 处理文件名：去掉_summary后缀
-            sample_name = os.path.splitext(file_name)[0]  # 去掉.csv
-            if sample_name.endswith('_summary'):
-                sample_name = sample_name[:-8]  # 去掉_summary
-            
-            results[sample_name] = extracted_data
-            print(f"  [成功] 成功提取数据")
-        else:
-            print(f"  [失败] 未能提取数据")
+        extracted_data = process_csv_document(csv_file)
+        if extracted_data is not None:
+            results[csv_sample_name(os.path.basename(csv_file))] = extracted_data
     
     # 4. 将结果转换为汇总表格式
     if results:
-        # 定义ESD类型列
-        esd_columns = [
-            'ESD 1-2 um', 'ESD 2-5 um', 'ESD 5-10 um', 'ESD 10-25 um', 
-            'ESD 25-50 um', 'ESD 50 um+',
-            'ESD 1-2 um SO', 'ESD 2-5 um SO', 'ESD 5-10 um SO', 
-            'ESD 10-25 um SO', 'ESD 25-50 um SO', 'ESD 50 um +SO'
-        ]
-        
-        # 创建汇总表
-        summary_data = []
-        
-        for idx, (sample_name, data) in enumerate(results.items(), 1):
-            # 创建一行数据
-            row_data = {
-                '序号': idx,
-                '样品名称': sample_name
-            }
-            
-            # 初始化所有ESD列为0
-            for col in esd_columns:
-                row_data[col] = 0
-            
-            # 从提取的数据中查找对应ESD类型的值
-            # 按照顺序匹配：ESD 1-2 um, ESD 2-5 um, ESD 5-10 um, ESD 10-25 um, 
-            # ESD 25-50 um, ESD 50 um+, ESD 1-2 um SO, ESD 2-5 um SO, 
-            # ESD 5-10 um SO, ESD 10-25 um SO, ESD 25-50 um SO, ESD 50 um +SO
-            for i, (_, row) in enumerate(data.iterrows()):
-                esd_type = str(row['ESD类型']).strip()
-                value = row['数值']
-                
-                if pd.notna(value) and i < len(esd_columns):
-                    try:
-                        value = float(value)
-                        # 直接按顺序匹配（第31-42行对应12个ESD类型）
-                        row_data[esd_columns[i]] = value
-                    except:
-                        pass
-            
-            summary_data.append(row_data)
-        
-        # 创建汇总DataFrame
-        summary_df = pd.DataFrame(summary_data)
-        
-        # 重新排列列的顺序
-        column_order = ['序号', '样品名称'] + esd_columns
-        summary_df = summary_df[column_order]
-        
-        print(f"\n\n汇总表:")
-        print(summary_df.to_string(index=False))
+        summary_df = build_csv_summary(results)
         
         # 5. 保存结果到Excel文件
-        output_file = os.path.join(csv_path, '提取结果.xlsx')
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            summary_df.to_excel(writer, sheet_name='结果汇总', index=False)
-        
-        print(f"\n\n所有结果已保存到: {output_file}")
-        print(f"汇总表已保存到工作表: 结果汇总")
+        save_summary(summary_df, os.path.join(csv_path, '提取结果.xlsx'))
     else:
         print("\n未提取到任何数据，无法生成汇总表")
     
@@ -565,6 +1655,375 @@ def function2_extract_csv():
     input("\n按回车键返回主菜单...")
 
 
+# 分片处理：清单文件和部分结果文件的格式版本
+MANIFEST_VERSION = 1
+
+# 清单文件和部分结果文件必须包含的字段
+MANIFEST_KEYS = ['version', 'kind', 'directory', 'files', 'files_digest']
+PARTIAL_KEYS = ['version', 'kind', 'directory', 'file_count', 'files_digest',
+                'shard_index', 'shard_count', 'parsed_count', 'skipped_files', 'entries']
+
+
+def _json_default(value):
+    """将numpy标量等对象转换为JSON可保存的类型"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _write_json(data, output_file):
+    """将数据保存为JSON文件，成功返回True，失败时打印错误并返回False"""
+    try:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=_json_default)
+    except OSError as e:
+        print(f"错误: 保存文件失败: {output_file} - {str(e)}")
+        return False
+    return True
+
+
+def _read_json(input_file, required_keys):
+    """
+    读取JSON文件并检查必需字段
+
+    Args:
+        input_file: JSON文件路径
+        required_keys: 必须包含的字段列表
+
+    Returns:
+        读取的字典，如果文件不存在、已损坏或缺少字段则打印错误并返回None
+    """
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"错误: 读取文件失败: {input_file} - {str(e)}")
+        return None
+
+    if not isinstance(data, dict) or any(key not in data for key in required_keys):
+        print(f"错误: 文件格式不正确: {input_file}")
+        return None
+    return data
+
+
+def _files_digest(files):
+    """
+    计算清单文件列表的摘要，用于确认各部分结果来自同一个清单
+
+    Args:
+        files: 清单中的文件列表（包含 index、file_name、original、size 字段）
+
+    Returns:
+        摘要字符串
+    """
+    items = [[entry['index'], entry['file_name'], entry['original'], entry['size']]
+             for entry in files]
+    return hashlib.sha256(json.dumps(items, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def create_manifest(kind, directory, manifest_file):
+    """
+    查找目录中的待处理文件并生成清单文件，供分片处理使用
+
+    PDF清单中同时记录内容相同的重复文件，分片时同一份内容只会分配给一个分片。
+
+    Args:
+        kind: 文件类型，'pdf' 或 'csv'
+        directory: 待处理文件所在目录
+        manifest_file: 清单文件保存路径
+
+    Returns:
+        清单字典，如果未找到文件则返回None
+    """
+    if kind == 'pdf':
+        file_paths = find_pdf_files(directory)
+    else:
+        file_paths = find_csv_files(directory)
+
+    if not file_paths:
+        print(f"\n在路径 {directory} 中未找到{kind.upper()}文件！")
+        return None
+
+    if kind == 'pdf':
+        canonical_files = group_duplicate_files(file_paths)
+    else:
+        canonical_files = {file_path: file_path for file_path in file_paths}
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'kind': kind,
+        'directory': os.path.abspath(directory),
+        'files': [
+            {
+                'index': index,
+                'file_name': os.path.basename(file_path),
+                'original': os.path.basename(canonical_files[file_path]),
+                'size': os.path.getsize(file_path),
+            }
+            for index, file_path in enumerate(file_paths)
+        ],
+    }
+    manifest['files_digest'] = _files_digest(manifest['files'])
+    if not _write_json(manifest, manifest_file):
+        return None
+
+    duplicate_count = sum(1 for entry in manifest['files'] if entry['original'] != entry['file_name'])
+    print(f"\n清单已保存到: {manifest_file}")
+    print(f"  文件数: {len(file_paths)}，重复文件数: {duplicate_count}")
+    return manifest
+
+
+def run_shard(manifest_file, shard_index, shard_count, output_file, input_dir=None):
+    """
+    处理清单中属于指定分片的文件，并将提取的数据保存为部分结果文件
+
+    按清单顺序对不重复的文件轮流分配分片，重复文件跟随其原件所在的分片。
+
+    Args:
+        manifest_file: 清单文件路径
+        shard_index: 分片序号（从0开始）
+        shard_count: 分片总数
+        output_file: 部分结果文件保存路径
+        input_dir: 文件所在目录（可选，默认使用清单中记录的目录）
+
+    Returns:
+        部分结果字典，如果参数无效、清单无法读取或文件目录不存在则返回None
+    """
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        print(f"错误: 无效的分片参数: 序号 {shard_index}，总数 {shard_count}")
+        return None
+
+    manifest = _read_json(manifest_file, MANIFEST_KEYS)
+    if manifest is None:
+        return None
+
+    if manifest['version'] != MANIFEST_VERSION:
+        print(f"错误: 不支持的清单版本: {manifest['version']}")
+        return None
+
+    if _files_digest(manifest['files']) != manifest['files_digest']:
+        print(f"错误: 清单文件已被修改或损坏: {manifest_file}")
+        return None
+
+    kind = manifest['kind']
+    directory = input_dir or manifest['directory']
+    if not os.path.isdir(directory):
+        print(f"错误: 文件目录不存在: {directory}（可使用 --input-dir 指定本机上的目录）")
+        return None
+
+    # 不重复的文件按清单顺序轮流分配
+    originals = [entry['file_name'] for entry in manifest['files']
+                 if entry['original'] == entry['file_name']]
+    assigned = set(originals[shard_index::shard_count])
+
+    print(f"\n分片 {shard_index + 1}/{shard_count}: 需要处理 {len(assigned)} 个文件")
+
+    extracted_cache = {}
+    skipped_files = []
+    parsed_count = 0
+    for file_name in originals:
+        if file_name not in assigned:
+            continue
+        file_path = os.path.join(directory, file_name)
+        if kind == 'pdf':
+            extracted_data, skipped = process_pdf_document(file_path)
+            if skipped:
+                skipped_files.append(file_name)
+            else:
+                parsed_count += 1
+        else:
+            extracted_data = process_csv_document(file_path)
+            parsed_count += 1
+        extracted_cache[file_name] = extracted_data
+
+    entries = []
+    for entry in manifest['files']:
+        if entry['original'] not in assigned:
+            continue
+        extracted_data = extracted_cache[entry['original']]
+        if extracted_data is not None and not extracted_data.empty:
+            data = {
+                'columns': list(extracted_data.columns),
+                'rows': extracted_data.values.tolist(),
+            }
+        else:
+            data = None
+        entries.append({
+            'index': entry['index'],
+            'file_name': entry['file_name'],
+            'original': entry['original'],
+            'size': entry['size'],
+            'data': data,
+        })
+
+    partial = {
+        'version': MANIFEST_VERSION,
+        'kind': kind,
+        'directory': manifest['directory'],
+        'file_count': len(manifest['files']),
+        'files_digest': manifest['files_digest'],
+        'shard_index': shard_index,
+        'shard_count': shard_count,
+        'parsed_count': parsed_count,
+        'skipped_files': skipped_files,
+        'entries': entries,
+    }
+    if not _write_json(partial, output_file):
+        return None
+
+    print(f"\n部分结果已保存到: {output_file}")
+    return partial
+
+
+def merge_partials(partial_files, output_file=None):
+    """
+    合并各分片的部分结果文件，生成与单机处理相同的汇总表
+
+    Args:
+        partial_files: 部分结果文件路径列表
+        output_file: 输出Excel文件路径（可选，默认保存到清单记录的目录；
+            该目录在本机不存在时保存到当前目录）
+
+    Returns:
+        汇总表DataFrame，如果部分结果无法读取、不完整或未提取到数据则返回None
+    """
+    if not partial_files:
+        print("错误: 未指定部分结果文件")
+        return None
+
+    partials = []
+    for partial_file in partial_files:
+        partial = _read_json(partial_file, PARTIAL_KEYS)
+        if partial is None:
+            return None
+        partials.append(partial)
+
+    # 检查所有部分结果来自同一个清单，且分片齐全
+    first = partials[0]
+    for partial in partials:
+        for key in ['version', 'kind', 'directory', 'file_count', 'files_digest', 'shard_count']:
+            if partial[key] != first[key]:
+                print(f"错误: 部分结果文件不属于同一次分片处理（{key} 不一致）")
+                return None
+
+    shard_indexes = sorted(partial['shard_index'] for partial in partials)
+    if shard_indexes != list(range(first['shard_count'])):
+        print(f"错误: 分片不完整或重复，期望 {first['shard_count']} 个分片，实际: {shard_indexes}")
+        return None
+
+    # 序号、文件名和原件必须与清单完全一致
+    try:
+        entries = sorted((entry for partial in partials for entry in partial['entries']),
+                         key=lambda entry: entry['index'])
+        consistent = ([entry['index'] for entry in entries] == list(range(first['file_count']))
+                      and _files_digest(entries) == first['files_digest'])
+    except (KeyError, TypeError):
+        consistent = False
+    if not consistent:
+        print("错误: 部分结果中的文件与清单不一致")
+        return None
+
+    # 按清单顺序重建提取结果，与单机处理的汇总逻辑保持一致
+    results = {}
+    duplicate_of = {}
+    for entry in entries:
+        if entry['original'] != entry['file_name']:
+            duplicate_of[entry['file_name']] = entry['original']
+        if entry['data'] is None:
+            continue
+        data = pd.DataFrame(entry['data']['rows'], columns=entry['data']['columns'])
+        if first['kind'] == 'pdf':
+            results[entry['file_name']] = data
+        else:
+            results[csv_sample_name(entry['file_name'])] = data
+
+    print(f"\n合并 {len(partials)} 个分片，共 {len(entries)} 个文件，成功提取 {len(results)} 个")
+    print_parse_report(
+        len(entries),
+        sum(partial['parsed_count'] for partial in partials),
+        [file_name for partial in partials for file_name in partial['skipped_files']],
+        duplicate_of,
+        {entry['file_name']: entry['size'] for entry in entries},
+    )
+
+    if not results:
+        print("\n未提取到任何数据，无法生成汇总表")
+        return None
+
+    if first['kind'] == 'pdf':
+        summary_df = build_pdf_summary(results, duplicate_of)
+    else:
+        summary_df = build_csv_summary(results)
+
+    if output_file is None:
+        output_dir = first['directory']
+        if not os.path.isdir(output_dir):
+            print(f"\n清单记录的目录在本机不存在: {output_dir}，汇总表将保存到当前目录")
+            output_dir = os.getcwd()
+        output_file = os.path.join(output_dir, '提取结果.xlsx')
+    save_summary(summary_df, output_file)
+    return summary_df
+
+
+def run_command_line(argv):
+    """
+    命令行模式（不带参数运行时进入交互菜单）
+
+    Args:
+        argv: 命令行参数列表（不含程序名）
+
+    Returns:
+        执行了命令时返回True；只指定了选项（如 --no-triage）时返回False，继续进入交互菜单。
+        命令执行失败时以状态码1退出程序
+    """
+    global ENABLE_TRIAGE
+
+    parser = argparse.ArgumentParser(description='数据提取工具（命令行模式）')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--triage-check', metavar='PDF文件夹',
+                       help='校验PDF预筛选的准确性')
+    group.add_argument('--manifest', nargs=2, metavar=('类型', '文件夹'),
+                       help='生成分片处理清单，类型为 pdf 或 csv')
+    group.add_argument('--shard', metavar='清单文件',
+                       help='处理清单中的一个分片')
+    group.add_argument('--merge', nargs='+', metavar='部分结果文件',
+                       help='合并各分片的部分结果，生成汇总表')
+    parser.add_argument('--shard-index', type=int, default=0,
+                        help='分片序号（从0开始）')
+    parser.add_argument('--shard-count', type=int, default=1,
+                        help='分片总数')
+    parser.add_argument('--input-dir',
+                        help='分片处理时文件所在目录（默认使用清单中记录的目录）')
+    parser.add_argument('--output',
+                        help='输出文件路径（清单文件、部分结果文件或汇总Excel文件）')
+    parser.add_argument('--no-triage', action='store_true',
+                        help='关闭PDF预筛选，所有PDF都完整提取（可与交互菜单或 --shard 一起使用）')
+    args = parser.parse_args(argv)
+
+    if args.no_triage:
+        ENABLE_TRIAGE = False
+
+    if args.triage_check:
+        result = evaluate_triage(args.triage_check)
+    elif args.manifest:
+        kind, directory = args.manifest
+        if kind not in ('pdf', 'csv'):
+            parser.error(f"不支持的文件类型: {kind}")
+        result = create_manifest(kind, directory, args.output or 'manifest.json')
+    elif args.shard:
+        output_file = args.output or f'partial_{args.shard_index}.json'
+        result = run_shard(args.shard, args.shard_index, args.shard_count, output_file, args.input_dir)
+    elif args.merge:
+        result = merge_partials(args.merge, args.output)
+    else:
+        return False
+
+    # 命令失败时以非零状态退出，便于批处理脚本判断是否继续
+    if result is None:
+        sys.exit(1)
+    return True
+
+
 def show_menu():
     """显示主菜单"""
     print("\n" + "=" * 60)
@@ -573,13 +2032,14 @@ def show_menu():
     print("\n请选择功能：")
     print("  1 - 提取PDF中样品数据")
     print("  2 - 提取CSV中样本数据")
+    print(f"  3 - 切换PDF预筛选（当前: {'开启' if ENABLE_TRIAGE else '关闭'}）")
     print("  ESC - 退出程序")
     print("\n" + "=" * 60)
 
 
 def get_user_choice():
     """获取用户选择（支持数字键和ESC键）"""
-    print("\n请输入选项（1/2）或按ESC退出: ", end='', flush=True)
+    print("\n请输入选项（1/2/3）或按ESC退出: ", end='', flush=True)
     
     # 使用input方式（更兼容）
     try:
@@ -593,6 +2053,12 @@ def get_user_choice():
 
 def main():
     """主函数"""
+    global ENABLE_TRIAGE
+
+    # 带参数运行时进入命令行模式（预筛选校验、分片处理等）
+    if len(sys.argv) > 1 and run_command_line(sys.argv[1:]):
+        return
+
     while True:
         show_menu()
         choice = get_user_choice()
@@ -604,6 +2070,10 @@ def main():
             function1_extract_pdf()
         elif choice == '2':
             function2_extract_csv()
+        elif choice == '3':
+            # 预筛选可能误判时，关闭后所有PDF都会完整提取
+            ENABLE_TRIAGE = not ENABLE_TRIAGE
+            print(f"\nPDF预筛选已{'开启' if ENABLE_TRIAGE else '关闭'}")
         else:
             print("\n无效的选择，请重新输入！")
             input("按回车键继续...")
@@ -0,0 +1,99 @@
+"""
+重复文件检测（group_duplicate_files）和解析情况报告（print_parse_report）的测试
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import extract_pdf_tables as ept
+
+
+def write_file(path, data):
+    """写入文件并返回路径字符串"""
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_identical_files_are_grouped(tmp_path):
+    data = b'%PDF-1.4\n' + os.urandom(4096)
+    first = write_file(tmp_path / 'a.pdf', data)
+    second = write_file(tmp_path / 'b.pdf', data)
+
+    canonical = ept.group_duplicate_files([first, second])
+
+    assert canonical[first] == canonical[second]
+
+
+def test_same_size_different_middle_is_not_duplicate(tmp_path, monkeypatch):
+    # 开头和结尾完全相同，只有中间不同：快速哈希相同，完整哈希不同
+    monkeypatch.setattr(ept, 'PARTIAL_HASH_BLOCK_SIZE', 16)
+    head = b'%PDF-1.4 header.'
+    tail = b'trailer %%EOF...'
+    first = write_file(tmp_path / 'a.pdf', head + b'A' * 64 + tail)
+    second = write_file(tmp_path / 'b.pdf', head + b'B' * 64 + tail)
+
+    assert ept._partial_file_hash(first) == ept._partial_file_hash(second)
+    assert ept._full_file_hash(first) != ept._full_file_hash(second)
+
+    canonical = ept.group_duplicate_files([first, second])
+
+    assert canonical[first] == first
+    assert canonical[second] == second
+
+
+def test_different_size_is_not_duplicate(tmp_path):
+    first = write_file(tmp_path / 'a.pdf', b'%PDF-1.4 same prefix')
+    second = write_file(tmp_path / 'b.pdf', b'%PDF-1.4 same prefix ')
+
+    canonical = ept.group_duplicate_files([first, second])
+
+    assert canonical[first] == first
+    assert canonical[second] == second
+
+
+def test_copy_keeps_shorter_name_as_original(tmp_path):
+    data = b'%PDF-1.4\n' + os.urandom(1024)
+    # 副本排在原件前面，原件仍然是文件名较短的那个
+    copy = write_file(tmp_path / 'xxx - 副本.pdf', data)
+    original = write_file(tmp_path / 'xxx.pdf', data)
+
+    canonical = ept.group_duplicate_files([copy, original])
+
+    assert canonical[copy] == original
+    assert canonical[original] == original
+
+
+def test_unreadable_file_is_kept_alone(tmp_path):
+    existing = write_file(tmp_path / 'a.pdf', b'%PDF-1.4')
+    missing = str(tmp_path / 'missing.pdf')
+
+    canonical = ept.group_duplicate_files([existing, missing])
+
+    assert canonical[existing] == existing
+    assert canonical[missing] == missing
+
+
+def test_report_counts_avoided_parses(capsys):
+    ept.print_parse_report(
+        file_count=4, parsed_count=2, skipped_files=[],
+        duplicate_of={'xxx - 副本.pdf': 'xxx.pdf', 'yyy - 副本.pdf': 'yyy.pdf'},
+        file_sizes={'xxx - 副本.pdf': 1024 * 1024, 'yyy - 副本.pdf': 1024 * 1024})
+
+    output = capsys.readouterr().out
+    assert '实际完整解析 2/4 个文件' in output
+    assert '重复文件 2 个，避免完整解析 2 次（节省 2.00 MB）' in output
+
+
+def test_report_does_not_count_duplicates_of_skipped_original(capsys):
+    # 原件被预筛选跳过时，它的副本本来也不会被完整解析，不算作避免的解析
+    ept.print_parse_report(
+        file_count=4, parsed_count=1, skipped_files=['xxx.pdf'],
+        duplicate_of={'xxx - 副本.pdf': 'xxx.pdf', 'yyy - 副本.pdf': 'yyy.pdf'},
+        file_sizes={'xxx - 副本.pdf': 1024 * 1024, 'yyy - 副本.pdf': 1024 * 1024})
+
+    output = capsys.readouterr().out
+    assert '实际完整解析 1/4 个文件' in output
+    assert '预筛选跳过 1 个非颗粒报告文件' in output
+    assert '重复文件 2 个，避免完整解析 1 次（节省 1.00 MB）' in output
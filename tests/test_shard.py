@@ -0,0 +1,263 @@
+"""
+分片处理（--manifest / --shard / --merge）的测试：分片合并的结果必须与单机处理完全相同
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import extract_pdf_tables as ept
+
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'src', 'extract_pdf_tables.py')
+SHARD_COUNT = 3
+
+
+def run_cli(*args, cwd):
+    """以子进程运行命令行模式，返回CompletedProcess"""
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    return subprocess.run([sys.executable, SCRIPT] + [str(arg) for arg in args],
+                          cwd=cwd, env=env, capture_output=True, text=True, encoding='utf-8')
+
+
+def write_csv(path, seed):
+    """生成45行的CSV文件，第31-42行第1列为ESD类型、第5列为数值"""
+    lines = []
+    for row in range(45):
+        label = f'ESD {row}' if 30 <= row < 42 else f'header {row}'
+        lines.append(f'{label},a,b,c,{seed * 100 + row}.5')
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def make_csv_folder(folder, count=7):
+    folder.mkdir()
+    for seed in range(count):
+        write_csv(folder / f'sample{seed}_summary.csv', seed)
+    # 行数不足的文件：提取失败，不进入汇总表
+    (folder / 'short.csv').write_text('a,b,c,d,e\n', encoding='utf-8')
+    return folder
+
+
+def single_run_csv(folder, monkeypatch):
+    """用交互菜单的功能2处理整个目录，返回生成的汇总表"""
+    answers = iter([str(folder)])
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers, ''))
+    ept.function2_extract_csv()
+    output_file = folder / '提取结果.xlsx'
+    summary_df = pd.read_excel(output_file)
+    output_file.unlink()
+    return summary_df
+
+
+def run_shards(manifest_file, work_dir):
+    """并行启动所有分片子进程，返回部分结果文件列表"""
+    partial_files = [work_dir / f'partial_{index}.json' for index in range(SHARD_COUNT)]
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    processes = [
+        subprocess.Popen([sys.executable, SCRIPT, '--shard', str(manifest_file),
+                          '--shard-index', str(index), '--shard-count', str(SHARD_COUNT),
+                          '--output', str(partial_files[index])],
+                         cwd=work_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        for index in range(SHARD_COUNT)
+    ]
+    for process in processes:
+        stdout, stderr = process.communicate()
+        assert process.returncode == 0, stdout.decode('utf-8') + stderr.decode('utf-8')
+    return partial_files
+
+
+@pytest.fixture
+def csv_folder(tmp_path):
+    return make_csv_folder(tmp_path / 'csv')
+
+
+@pytest.fixture
+def csv_partials(csv_folder, tmp_path):
+    """生成清单并运行所有分片，返回 (清单文件, 部分结果文件列表)"""
+    manifest_file = tmp_path / 'manifest.json'
+    result = run_cli('--manifest', 'csv', csv_folder, '--output', manifest_file, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return manifest_file, run_shards(manifest_file, tmp_path)
+
+
+def test_csv_shards_match_single_run(csv_folder, csv_partials, tmp_path, monkeypatch):
+    expected = single_run_csv(csv_folder, monkeypatch)
+    _, partial_files = csv_partials
+
+    # 故意打乱部分结果的顺序，合并结果仍按清单顺序编号
+    merged_file = tmp_path / 'merged.xlsx'
+    result = run_cli('--merge', *reversed(partial_files), '--output', merged_file, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    merged = pd.read_excel(merged_file)
+    pd.testing.assert_frame_equal(merged, expected)
+    assert merged['序号'].tolist() == list(range(1, 8))
+
+
+def test_merge_default_output_goes_to_manifest_directory(csv_folder, csv_partials, tmp_path):
+    _, partial_files = csv_partials
+
+    result = run_cli('--merge', *partial_files, cwd=tmp_path)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert (csv_folder / '提取结果.xlsx').exists()
+
+
+def test_merge_rejects_missing_shard(csv_partials, tmp_path):
+    _, partial_files = csv_partials
+    merged_file = tmp_path / 'merged.xlsx'
+
+    result = run_cli('--merge', *partial_files[:-1], '--output', merged_file, cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert '分片不完整或重复' in result.stdout
+    assert not merged_file.exists()
+
+
+def test_merge_rejects_duplicated_shard(csv_partials, tmp_path):
+    _, partial_files = csv_partials
+    merged_file = tmp_path / 'merged.xlsx'
+
+    result = run_cli('--merge', partial_files[0], partial_files[0], partial_files[1],
+                     '--output', merged_file, cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert '分片不完整或重复' in result.stdout
+    assert not merged_file.exists()
+
+
+def test_merge_rejects_shard_count_mismatch(csv_folder, csv_partials, tmp_path):
+    manifest_file, partial_files = csv_partials
+    other_partial = tmp_path / 'other.json'
+    result = run_cli('--shard', manifest_file, '--shard-index', 0, '--shard-count', 2,
+                     '--output', other_partial, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    result = run_cli('--merge', other_partial, *partial_files[1:],
+                     '--output', tmp_path / 'merged.xlsx', cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert 'shard_count 不一致' in result.stdout
+
+
+def test_merge_rejects_partials_from_different_manifest(csv_folder, csv_partials, tmp_path):
+    _, partial_files = csv_partials
+
+    # 文件数不变但文件名改变：重新生成的清单摘要不同
+    os.rename(csv_folder / 'short.csv', csv_folder / 'short2.csv')
+    new_manifest = tmp_path / 'manifest2.json'
+    result = run_cli('--manifest', 'csv', csv_folder, '--output', new_manifest, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+    new_partial = tmp_path / 'new_partial_0.json'
+    result = run_cli('--shard', new_manifest, '--shard-index', 0, '--shard-count', SHARD_COUNT,
+                     '--output', new_partial, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    merged_file = tmp_path / 'merged.xlsx'
+    result = run_cli('--merge', new_partial, *partial_files[1:], '--output', merged_file,
+                     cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert 'files_digest 不一致' in result.stdout
+    assert not merged_file.exists()
+
+
+def test_merge_rejects_edited_entries(csv_partials, tmp_path):
+    _, partial_files = csv_partials
+    partial = json.loads(partial_files[0].read_text(encoding='utf-8'))
+    partial['entries'][0]['file_name'] = 'renamed.csv'
+    partial_files[0].write_text(json.dumps(partial, ensure_ascii=False), encoding='utf-8')
+
+    result = run_cli('--merge', *partial_files, '--output', tmp_path / 'merged.xlsx', cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert '部分结果中的文件与清单不一致' in result.stdout
+
+
+def test_merge_rejects_corrupt_partial(csv_partials, tmp_path):
+    _, partial_files = csv_partials
+    partial_files[1].write_text('{"version": 1, "entr', encoding='utf-8')
+
+    result = run_cli('--merge', *partial_files, '--output', tmp_path / 'merged.xlsx', cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert '错误' in result.stdout
+
+
+def test_shard_rejects_edited_manifest(csv_partials, tmp_path):
+    manifest_file, _ = csv_partials
+    manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+    manifest['files'].pop()
+    manifest_file.write_text(json.dumps(manifest, ensure_ascii=False), encoding='utf-8')
+    partial_file = tmp_path / 'partial.json'
+
+    result = run_cli('--shard', manifest_file, '--shard-index', 0, '--shard-count', SHARD_COUNT,
+                     '--output', partial_file, cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert '清单文件已被修改或损坏' in result.stdout
+    assert not partial_file.exists()
+
+
+@pytest.mark.parametrize('shard_index, shard_count', [(3, 3), (-1, 3), (0, 0)])
+def test_shard_rejects_invalid_shard_arguments(csv_partials, tmp_path, shard_index, shard_count):
+    manifest_file, _ = csv_partials
+    partial_file = tmp_path / 'partial.json'
+
+    result = run_cli('--shard', manifest_file, '--shard-index', shard_index,
+                     '--shard-count', shard_count, '--output', partial_file, cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert '无效的分片参数' in result.stdout
+    assert not partial_file.exists()
+
+
+def fake_extract_table(pdf_file):
+    """根据文件内容生成提取结果，代替pdfplumber解析"""
+    with open(pdf_file, 'rb') as f:
+        seed = int(f.read().split()[-1])
+    if seed < 0:
+        return None
+    return pd.DataFrame({
+        'Particle Size(µm)': [2, 5, 10, 25, 50],
+        'Cumulative Counts/mL': [seed * 10 + size for size in [2, 5, 10, 25, 50]],
+    })
+
+
+def test_pdf_shards_match_single_run_with_duplicates(tmp_path, monkeypatch):
+    monkeypatch.setattr(ept, 'extract_table_from_pdf', fake_extract_table)
+    monkeypatch.setattr(ept, 'ENABLE_TRIAGE', False)
+
+    folder = tmp_path / 'pdf'
+    folder.mkdir()
+    for name, seed in [('a.pdf', 1), ('b.pdf', 2), ('c.pdf', 3), ('d.pdf', -1),
+                       ('e.pdf', 5), ('a - 副本.pdf', 1), ('c - 副本.pdf', 3)]:
+        (folder / name).write_bytes(b'%%PDF-1.4 sample %d' % seed)
+
+    answers = iter([str(folder)])
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers, ''))
+    ept.function1_extract_pdf()
+    expected = pd.read_excel(folder / '提取结果.xlsx')
+
+    manifest_file = tmp_path / 'manifest.json'
+    assert ept.create_manifest('pdf', str(folder), str(manifest_file)) is not None
+    partial_files = []
+    for index in range(SHARD_COUNT):
+        partial_file = str(tmp_path / f'partial_{index}.json')
+        partial = ept.run_shard(str(manifest_file), index, SHARD_COUNT, partial_file)
+        # 重复文件与原件分配在同一个分片
+        file_names = {entry['file_name'] for entry in partial['entries']}
+        assert ('a.pdf' in file_names) == ('a - 副本.pdf' in file_names)
+        assert ('c.pdf' in file_names) == ('c - 副本.pdf' in file_names)
+        partial_files.append(partial_file)
+
+    merged_file = str(tmp_path / 'merged.xlsx')
+    ept.merge_partials(partial_files, merged_file)
+
+    pd.testing.assert_frame_equal(pd.read_excel(merged_file), expected)
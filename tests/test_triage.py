@@ -0,0 +1,259 @@
+"""
+PDF预筛选（triage_pdf）的回归测试
+"""
+
+import base64
+import os
+import sys
+import zlib
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import extract_pdf_tables as ept
+
+
+REPORT_TEXT = (b'BT /F1 10 Tf 50 700 Td (Run No. Particle Size(um) Cumulative Count '
+               b'Differential Count Cumulative Counts/mL) Tj ET\n'
+               b'BT /F1 10 Tf 50 680 Td (This report was generated by the instrument.) Tj ET')
+CERTIFICATE_TEXT = (b'BT /F1 10 Tf 50 700 Td (This certificate confirms the calibration '
+                    b'of the instrument.) Tj ET')
+STANDARD_FONT = b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+FONT_RESOURCES = b'<< /Font << /F1 5 0 R >> >>'
+
+
+def stream_object(data, entries=b''):
+    """生成使用FlateDecode压缩的数据流对象"""
+    compressed = zlib.compress(data)
+    return (b'<< /Length %d /Filter /FlateDecode ' % len(compressed) + entries
+            + b' >>\nstream\n' + compressed + b'\nendstream')
+
+
+def to_unicode_cmap(mapping):
+    """生成两字节编码的ToUnicode CMap，mapping为 编码 -> 文本"""
+    lines = [b'begincmap', b'1 begincodespacerange <0000> <FFFF> endcodespacerange',
+             b'%d beginbfchar' % len(mapping)]
+    for code, text in mapping.items():
+        lines.append(b'<%04X> <%s>' % (code, text.encode('utf-16-be').hex().encode('ascii')))
+    lines += [b'endbfchar', b'endcmap']
+    return b'\n'.join(lines)
+
+
+def write_pdf(path, content, filters=b'/FlateDecode', font=STANDARD_FONT, stream_data=None,
+              resources=FONT_RESOURCES, extra_objects=()):
+    """生成只有一页的最小PDF文件（对象6及以后为extra_objects）"""
+    if stream_data is None:
+        stream_data = zlib.compress(content) if filters == b'/FlateDecode' else content
+    stream_dict = b'<< /Length %d' % len(stream_data)
+    if filters:
+        stream_dict += b' /Filter ' + filters
+    stream_dict += b' >>'
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Resources ' + resources + b' /Contents 4 0 R >>',
+        stream_dict + b'\nstream\n' + stream_data + b'\nendstream',
+        font,
+    ] + list(extra_objects)
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, xref_offset)
+    path.write_bytes(bytes(output))
+    return str(path)
+
+
+def pdfplumber_text(pdf_path):
+    """用pdfplumber读取第一页文本（小写）"""
+    with ept.pdfplumber.open(pdf_path) as pdf:
+        return (pdf.pages[0].extract_text() or '').lower()
+
+
+def test_report_with_balanced_parentheses_is_positive(tmp_path):
+    pdf_path = write_pdf(tmp_path / 'report.pdf', REPORT_TEXT)
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_POSITIVE
+
+    # pdfplumber读取到的文本同样包含全部关键词
+    page_text = pdfplumber_text(pdf_path)
+    assert all(keyword in page_text for keyword in ept.TRIAGE_KEYWORDS)
+
+
+def test_octal_and_paren_escapes_are_decoded(tmp_path):
+    content = (b'BT /F1 10 Tf (Particle Size\\050\\265m\\051 Cumulative \\(Counts/mL\\)) Tj ET\n'
+               b'BT /F1 10 Tf (This report was generated by the instrument.) Tj ET')
+    pdf_path = write_pdf(tmp_path / 'report.pdf', content)
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_POSITIVE
+
+
+def test_certificate_is_negative(tmp_path):
+    pdf_path = write_pdf(tmp_path / 'certificate.pdf', CERTIFICATE_TEXT)
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_NEGATIVE
+
+
+@pytest.mark.parametrize('hex_text', [
+    b'[-250 <00410042>] TJ',
+    b'<00410042> Tj',
+    b"<00410042> '",
+    b'1 2 <00410042> "',
+])
+def test_hex_text_without_to_unicode_is_unknown(tmp_path, hex_text):
+    content = CERTIFICATE_TEXT + b'\nBT /F1 10 Tf ' + hex_text + b' ET'
+    pdf_path = write_pdf(tmp_path / 'cid.pdf', content)
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_UNKNOWN
+
+
+def test_type0_font_with_predefined_cmap_is_unknown(tmp_path):
+    # STSong-Light + UniGB-UCS2-H，字符串为两字节UCS-2编码，没有ToUnicode
+    text = 'Run No. Particle Size(um) Cumulative Count Cumulative Counts/mL'
+    content = (b'BT /F1 10 Tf 50 700 Td (' + text.encode('utf-16-be').replace(b'\\', b'\\\\')
+               .replace(b'(', b'\\(').replace(b')', b'\\)') + b') Tj ET')
+    font = (b'<< /Type /Font /Subtype /Type0 /BaseFont /STSong-Light '
+            b'/Encoding /UniGB-UCS2-H /DescendantFonts [6 0 R] >>')
+    descendant = (b'<< /Type /Font /Subtype /CIDFontType0 /BaseFont /STSong-Light '
+                  b'/CIDSystemInfo << /Registry (Adobe) /Ordering (GB1) /Supplement 2 >> '
+                  b'/FontDescriptor 7 0 R >>')
+    descriptor = (b'<< /Type /FontDescriptor /FontName /STSong-Light /Flags 6 '
+                  b'/FontBBox [0 0 1000 1000] /ItalicAngle 0 /Ascent 880 /Descent -120 '
+                  b'/CapHeight 880 /StemV 93 >>')
+    pdf_path = write_pdf(tmp_path / 'stsong.pdf', content, font=font,
+                         extra_objects=[descendant, descriptor])
+
+    assert 'cumulative counts/ml' in pdfplumber_text(pdf_path)
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_UNKNOWN
+
+
+def _identity_h_pdf(tmp_path, text):
+    """生成使用Identity-H复合字体和ToUnicode映射的PDF"""
+    chars = sorted(set(text))
+    codes = {char: index + 1 for index, char in enumerate(chars)}
+    content = b'BT /F1 10 Tf 50 700 Td <' + ''.join(
+        '%04X' % codes[char] for char in text).encode('ascii') + b'> Tj ET'
+    font = (b'<< /Type /Font /Subtype /Type0 /BaseFont /ABCDEF+SimSun /Encoding /Identity-H '
+            b'/DescendantFonts [6 0 R] /ToUnicode 7 0 R >>')
+    descendant = (b'<< /Type /Font /Subtype /CIDFontType2 /BaseFont /ABCDEF+SimSun '
+                  b'/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> >>')
+    cmap = stream_object(to_unicode_cmap({code: char for char, code in codes.items()}))
+    return write_pdf(tmp_path / 'identity.pdf', content, font=font,
+                     extra_objects=[descendant, cmap])
+
+
+def test_identity_h_font_with_to_unicode_is_decoded(tmp_path):
+    report = _identity_h_pdf(tmp_path, '检测报告 Particle Size(µm) Cumulative Counts/mL')
+    assert ept.triage_pdf(report)[0] == ept.TRIAGE_POSITIVE
+
+    certificate = _identity_h_pdf(tmp_path, '校准证书 This certificate confirms the calibration')
+    assert ept.triage_pdf(certificate)[0] == ept.TRIAGE_NEGATIVE
+
+
+def test_unused_encoded_font_does_not_block_negative(tmp_path):
+    resources = b'<< /Font << /F1 5 0 R /F2 6 0 R >> >>'
+    unused_font = (b'<< /Type /Font /Subtype /Type0 /BaseFont /STSong-Light '
+                   b'/Encoding /UniGB-UCS2-H /DescendantFonts [] >>')
+    pdf_path = write_pdf(tmp_path / 'certificate.pdf', CERTIFICATE_TEXT, resources=resources,
+                         extra_objects=[unused_font])
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_NEGATIVE
+
+
+def test_differences_with_letter_glyphs_are_decoded(tmp_path):
+    font = (b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+            b'/Encoding << /Differences [1 /P /a /r /t /i /c /l /e] >> >>')
+    content = CERTIFICATE_TEXT + b'\nBT /F1 10 Tf (\\001\\002\\003\\004\\005\\006\\007\\010) Tj ET'
+    pdf_path = write_pdf(tmp_path / 'differences.pdf', content, font=font)
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_NEGATIVE
+
+
+def test_differences_with_unknown_glyphs_is_unknown(tmp_path):
+    font = (b'<< /Type /Font /Subtype /Type1 /BaseFont /ABCDEF+Custom '
+            b'/Encoding << /Differences [84 /g12 /g13] >> >>')
+    pdf_path = write_pdf(tmp_path / 'differences.pdf', CERTIFICATE_TEXT, font=font)
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_UNKNOWN
+
+
+def test_missing_font_resource_is_unknown(tmp_path):
+    pdf_path = write_pdf(tmp_path / 'nofont.pdf', CERTIFICATE_TEXT.replace(b'/F1', b'/F9'))
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_UNKNOWN
+
+
+def test_text_inside_form_xobject_is_read(tmp_path):
+    # 表单的资源中有 /ImageB，名称中有 Image，都不能让它被当成图片
+    form = stream_object(REPORT_TEXT, b'/Type /XObject /Subtype /Form /BBox [0 0 612 792] '
+                                      b'/Resources << /ProcSet [/PDF /Text /ImageB] '
+                                      b'/Font << /F1 5 0 R >> >>')
+    resources = b'<< /Font << /F1 5 0 R >> /XObject << /Image5 6 0 R >> >>'
+    content = CERTIFICATE_TEXT.replace(b'700 Td', b'400 Td') + b'\nq /Image5 Do Q'
+    pdf_path = write_pdf(tmp_path / 'form.pdf', content, resources=resources,
+                         extra_objects=[form])
+
+    page_text = pdfplumber_text(pdf_path)
+    assert all(keyword in page_text for keyword in ept.TRIAGE_KEYWORDS)
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_POSITIVE
+
+
+def test_image_xobject_is_ignored(tmp_path):
+    image = stream_object(b'\xff' * 300, b'/Type /XObject /Subtype /Image /Width 10 /Height 10 '
+                                         b'/ColorSpace /DeviceRGB /BitsPerComponent 8')
+    resources = b'<< /Font << /F1 5 0 R >> /XObject << /Im1 6 0 R >> >>'
+    content = CERTIFICATE_TEXT + b'\nq 10 0 0 10 0 0 cm /Im1 Do Q'
+    pdf_path = write_pdf(tmp_path / 'image.pdf', content, resources=resources,
+                         extra_objects=[image])
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_NEGATIVE
+
+
+def test_corrupt_stream_is_unknown(tmp_path):
+    pdf_path = write_pdf(tmp_path / 'corrupt.pdf', CERTIFICATE_TEXT,
+                         stream_data=b'not zlib data ' * 10)
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_UNKNOWN
+
+
+def test_ascii85_flate_filter_chain_is_decoded(tmp_path):
+    # ReportLab默认使用 [/ASCII85Decode /FlateDecode]
+    stream_data = base64.a85encode(zlib.compress(CERTIFICATE_TEXT)) + b'~>'
+    pdf_path = write_pdf(tmp_path / 'a85.pdf', CERTIFICATE_TEXT, stream_data=stream_data,
+                         filters=b'[/ASCII85Decode /FlateDecode]')
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_NEGATIVE
+
+
+def test_unsupported_filter_is_unknown(tmp_path):
+    pdf_path = write_pdf(tmp_path / 'lzw.pdf', CERTIFICATE_TEXT, filters=b'/LZWDecode')
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_UNKNOWN
+
+
+def test_truncated_stream_is_unknown(tmp_path, monkeypatch):
+    monkeypatch.setattr(ept, 'TRIAGE_MAX_STREAM_SIZE', 16)
+    pdf_path = write_pdf(tmp_path / 'large.pdf', CERTIFICATE_TEXT)
+
+    assert ept.triage_pdf(pdf_path)[0] == ept.TRIAGE_UNKNOWN
+
+
+def test_disabled_triage_always_extracts(tmp_path, monkeypatch):
+    pdf_path = write_pdf(tmp_path / 'certificate.pdf', CERTIFICATE_TEXT)
+    calls = []
+    monkeypatch.setattr(ept, 'extract_table_from_pdf', lambda path: calls.append(path))
+
+    assert ept.process_pdf_document(pdf_path) == (None, True)
+    assert calls == []
+
+    monkeypatch.setattr(ept, 'ENABLE_TRIAGE', False)
+    assert ept.process_pdf_document(pdf_path) == (None, False)
+    assert calls == [pdf_path]